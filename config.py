@@ -1,12 +1,23 @@
 import json
+import mmap
 import os
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjsonがない環境では標準のjsonを使う
+    orjson = None
 
 
 class Config:
     """設定を管理するクラス"""
     DEFAULT_CONFIG_PATH = "solcast_config.json"
     
+    # 読み込み済みの設定（パスごとに更新時刻と内容を保持）
+    _cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    _cache_lock = threading.Lock()
+    
     def __init__(self, config_path=None):
         """コンフィグの初期化"""
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
@@ -14,16 +25,35 @@ class Config:
         self._load_from_file()
     
     def _load_from_file(self):
-        """設定ファイルから読み込み"""
-        try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, "r", encoding="utf-8") as f:
-                    self.config_data = json.load(f)
-            else:
+        """設定ファイルから読み込み（更新されていなければキャッシュを使う）"""
+        with Config._cache_lock:
+            try:
+                if os.path.exists(self.config_path):
+                    mtime = os.stat(self.config_path).st_mtime
+                    cached = Config._cache.get(self.config_path)
+                    if cached is not None and cached[0] == mtime:
+                        self.config_data = cached[1].copy()
+                        return
+                    
+                    if orjson is not None:
+                        # mmapしたファイルをそのままorjsonに渡し、中間の文字列を作らない
+                        # 空ファイルはmmapできないため空の設定として扱う
+                        if os.path.getsize(self.config_path) > 0:
+                            with open(self.config_path, "rb") as f, \
+                                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                                    memoryview(mm) as view:
+                                self.config_data = orjson.loads(view)
+                        else:
+                            self.config_data = {}
+                    else:
+                        with open(self.config_path, "r", encoding="utf-8") as f:
+                            self.config_data = json.load(f)
+                    Config._cache[self.config_path] = (mtime, self.config_data.copy())
+                else:
+                    self.config_data = {}
+            except Exception as e:
+                print(f"設定の読み込みに失敗しました: {e}")
                 self.config_data = {}
-        except Exception as e:
-            print(f"設定の読み込みに失敗しました: {e}")
-            self.config_data = {}
     
     def get(self, key, default=None):
         """設定値を取得する"""
@@ -37,8 +67,15 @@ class Config:
     def save(self):
         """設定をファイルに保存する"""
         try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(self.config_data, f, indent=2)
+            with Config._cache_lock:
+                if orjson is not None:
+                    with open(self.config_path, "wb") as f:
+                        f.write(orjson.dumps(self.config_data, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(self.config_path, "w", encoding="utf-8") as f:
+                        json.dump(self.config_data, f, indent=2)
+                # 書き込んだ内容でキャッシュを更新
+                Config._cache[self.config_path] = (os.stat(self.config_path).st_mtime, self.config_data.copy())
             return True
         except Exception as e:
             print(f"設定の保存に失敗しました: {e}")
@@ -47,4 +84,18 @@ class Config:
     @classmethod
     def load(cls, config_path=None):
         """設定をロードする（クラスメソッド）"""
-        return cls(config_path)
\ No newline at end of file
+        return cls(config_path)
+    
+    @classmethod
+    def get_api_key(cls) -> str:
+        """共有設定からAPIキーを取得する"""
+        return config.get("api_key", "")
+    
+    @classmethod
+    def save_api_key(cls, api_key: str) -> bool:
+        """共有設定にAPIキーを保存する"""
+        return config.set("api_key", api_key).save()
+
+
+# アプリケーション全体で共有する設定（同じファイルを何度も読み書きしないように1つにまとめる）
+config = Config()
\ No newline at end of file
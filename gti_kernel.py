@@ -0,0 +1,48 @@
+"""
+ソーラーカー用GTI(全天傾斜日射量)計算のnumbaカーネル
+
+numbaがインストールされている場合のみSolcastAPIから使用される。
+計算内容はSolcastAPI._calculate_gti_for_solar_carと同じ。
+"""
+import math
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def solar_car_gti(ghi, dni, zenith, azimuth, tilt, direction):
+    """全ての時刻のソーラーカー用GTIを計算する（角度はすべて度単位）"""
+    n = ghi.shape[0]
+    gti = np.empty(n)
+    
+    # 傾斜角と走行方向はリクエスト内で共通
+    tilt_rad = math.radians(tilt)
+    cos_tilt = math.cos(tilt_rad)
+    sin_tilt = math.sin(tilt_rad)
+    direction_rad = math.radians(direction)
+    
+    # 地面反射成分のアルベドとソーラーカー特有の補正
+    albedo = 0.2
+    car_correction = 0.95
+    
+    for i in prange(n):
+        zenith_rad = math.radians(zenith[i])
+        cos_zenith = math.cos(zenith_rad)
+        
+        # 太陽光の入射角を計算（パネル法線と太陽光の角度）
+        cos_incidence = (cos_tilt * cos_zenith +
+                         sin_tilt * math.sin(zenith_rad) * math.cos(math.radians(azimuth[i]) - direction_rad))
+        
+        # 直達成分（入射角が90度以上なら0）
+        beam = dni[i] * max(0.0, cos_incidence)
+        
+        # 散乱成分（簡易等方性モデル）
+        diffuse = max(0.0, (ghi[i] - dni[i] * cos_zenith) * (1 + cos_tilt) / 2)
+        
+        # 地面反射成分
+        reflected = ghi[i] * albedo * (1 - cos_tilt) / 2
+        
+        gti[i] = (beam + diffuse + reflected) * car_correction
+    
+    return gti
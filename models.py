@@ -3,9 +3,9 @@ from datetime import datetime
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class SolarForecast:
-    """太陽光予測データを格納するクラス"""
+    """太陽光予測データを格納するクラス（件数が多くなるため__slots__で省メモリ化）"""
     time: datetime
     ghi: float  # 全天日射量-水平面 (W/m^2)
     forecast_radiation: float  # 直達日射量 (W/m^2)
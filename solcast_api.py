@@ -1,15 +1,80 @@
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.request import ACCEPT_ENCODING
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import hashlib
+import itertools
 import json
-from typing import List, Dict, Any, Optional
+import logging
+import os
+import threading
+import time
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from models import SolarForecast, ForecastRequest
 from dateutil.parser import parse
 import math
 
+try:
+    import ijson
+    _PARSE_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:  # ijsonがない環境ではレスポンス全体を読み込んでから処理する
+    ijson = None
+    _PARSE_ERRORS = (ValueError,)
+
+try:
+    import orjson
+except ImportError:  # orjsonがない環境では標準のjsonを使う
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # numpyがない環境では従来のスカラー計算を使う
+    np = None
+
+try:
+    from gti_kernel import solar_car_gti
+except ImportError:  # numbaがない環境ではnumpyまたはスカラーでGTIを計算する
+    solar_car_gti = None
+
+logger = logging.getLogger(__name__)
+
+# 太陽赤緯の計算に使う係数（360/365度をラジアンに変換したもの）
+_DECLINATION_K = math.radians(360 / 365)
+
+
+def _create_session() -> requests.Session:
+    """接続を使い回すためのセッションを作成する"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # 長期間の予測はレスポンスが大きいので圧縮を要求する
+    # brはurllib3が展開できる場合（brotliがインストールされている場合）のみ要求する
+    session.headers["Accept-Encoding"] = "br, gzip" if "br" in ACCEPT_ENCODING else "gzip"
+    return session
+
 
 class SolcastAPI:
     """Solcast APIとの通信を処理するクラス"""
     BASE_URL = "https://api.solcast.com.au"
+    # 接続タイムアウトと読み込みタイムアウト（秒）
+    REQUEST_TIMEOUT = (5, 30)
+    
+    # 更新のたびにTLSハンドシェイクをやり直さないようセッションを共有する
+    _session: requests.Session = _create_session()
+    
+    # 同じ条件での再取得はAPIを呼ばずにキャッシュした予測データを使う
+    CACHE_DIR = "solcast_cache"
+    CACHE_TTL = 15 * 60  # キャッシュの有効期間（秒）
+    CACHE_SIZE = 32  # メモリに保持するレスポンス数
+    _cache: "OrderedDict[str, tuple]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    # リクエスト条件ごとに組み立て済みのパラメータとキャッシュキーを保持する
+    PARAMS_POOL_SIZE = 64
+    _params_pool: Dict[tuple, Tuple[Dict[str, Any], str]] = {}
     
     @staticmethod
     def get_forecast(request: ForecastRequest) -> List[SolarForecast]:
@@ -19,6 +84,65 @@ class SolcastAPI:
         # 最新のエンドポイントを使用
         forecast_url = f"{SolcastAPI.BASE_URL}/data/forecast/radiation_and_weather"
         
+        params, cache_key = SolcastAPI._build_params(request)
+        forecast_items = SolcastAPI._get_cached_items(cache_key)
+        
+        if forecast_items is None:
+            try:
+                logger.debug("予測データ取得中: %s", forecast_url)
+                with SolcastAPI._session.get(forecast_url, params=params, stream=True,
+                                             timeout=SolcastAPI.REQUEST_TIMEOUT) as response:
+                    logger.debug("レスポンスステータス: %s", response.status_code)
+                    
+                    if response.status_code == 429:
+                        logger.warning("レート制限に達しました。しばらく待ってから再試行してください。")
+                        return []
+                        
+                    if response.status_code != 200:
+                        logger.error("APIエラー: %s - %s", response.status_code, response.text)
+                        return []
+                        
+                    response.raise_for_status()
+                    forecast_items = list(SolcastAPI._iter_forecast_items(response))
+                
+            # ijsonはresponse.rawを直接読むため、本文の途中での通信エラーは
+            # requestsの例外に包まれずurllib3の例外のまま送出される
+            except (requests.RequestException, Urllib3HTTPError) as e:
+                logger.error("API通信エラー: %s", e)
+                return []
+            except _PARSE_ERRORS as e:
+                logger.error("レスポンスの解析に失敗しました: %s", e)
+                return []
+            
+            if forecast_items:
+                SolcastAPI._store_cached_items(cache_key, forecast_items)
+        else:
+            logger.debug("キャッシュされた予測データを使用します: %s", cache_key)
+        
+        # データの整形と太陽位置の計算（ソーラーカーモードの設定も渡す）
+        return SolcastAPI._process_forecast_data(
+            forecast_items,
+            request.latitude,
+            request.longitude,
+            request.timezone_offset,
+            request.specific_date,
+            request.is_solar_car,
+            request.solar_car_tilt,
+            request.solar_car_direction
+        )
+    
+    @staticmethod
+    def _build_params(request: ForecastRequest) -> Tuple[Dict[str, Any], str]:
+        """
+        リクエストパラメータとそのキャッシュキーを作成する
+        同じ条件での再取得では組み立て済みのものを使い回す（パラメータはコピーを返す）
+        """
+        pool_key = (request.latitude, request.longitude, request.hours, request.interval,
+                    request.array_type, request.tilt, request.azimuth, request.api_key)
+        pooled = SolcastAPI._params_pool.get(pool_key)
+        if pooled is not None:
+            return pooled[0].copy(), pooled[1]
+        
         # APIドキュメントに従ったパラメータ
         params = {
             "latitude": request.latitude,
@@ -46,95 +170,203 @@ class SolcastAPI:
         # 注意: start_dateパラメータを使わないようにする
         # 代わりに後でフィルタリングする
         
-        try:
-            print(f"予測データ取得中: {forecast_url}")
-            response = requests.get(forecast_url, params=params)
-            print(f"レスポンスステータス: {response.status_code}")
-            
-            if response.status_code == 429:
-                print("レート制限に達しました。しばらく待ってから再試行してください。")
-                return []
-                
-            if response.status_code != 200:
-                print(f"APIエラー: {response.status_code} - {response.text}")
-                return []
-                
-            response.raise_for_status()
-            data = response.json()
+        cache_key = SolcastAPI._cache_key(params)
+        if len(SolcastAPI._params_pool) >= SolcastAPI.PARAMS_POOL_SIZE:
+            SolcastAPI._params_pool.clear()
+        SolcastAPI._params_pool[pool_key] = (params, cache_key)
+        return params.copy(), cache_key
+    
+    @staticmethod
+    def _cache_key(params: Dict[str, Any]) -> str:
+        """リクエストパラメータからキャッシュのキーを作成する"""
+        return hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _get_cached_items(key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        有効期間内のキャッシュがあれば予測データのアイテムを返す
+        メモリになければCACHE_DIRのファイルを探す（アプリ再起動後も使えるように）
+        """
+        with SolcastAPI._cache_lock:
+            cached = SolcastAPI._cache.get(key)
+            if cached is not None:
+                stored_at, items = cached
+                if time.monotonic() - stored_at < SolcastAPI.CACHE_TTL:
+                    SolcastAPI._cache.move_to_end(key)
+                    return items
+                del SolcastAPI._cache[key]
             
-            # APIからのレスポンス構造をデバッグ出力
-            if "forecasts" in data and data["forecasts"]:
-                first_item = data["forecasts"][0]
-                print(f"最初の予測データの利用可能なフィールド: {list(first_item.keys())}")
+            path = os.path.join(SolcastAPI.CACHE_DIR, f"{key}.json")
+            try:
+                with open(path, "rb") as f:
+                    data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning("キャッシュの読み込みに失敗しました: %s", e)
+                return None
             
-            # データの整形と太陽位置の計算
-            # ソーラーカーモードの場合の処理を追加
-            is_solar_car = getattr(request, 'is_solar_car', False)
-            solar_car_tilt = getattr(request, 'solar_car_tilt', 10.0)
-            solar_car_direction = getattr(request, 'solar_car_direction', 180.0)
+            age = time.time() - data.get("fetched_at", 0)
+            if not 0 <= age < SolcastAPI.CACHE_TTL:
+                SolcastAPI._remove_cache_file(path)
+                return None
             
-            return SolcastAPI._process_forecast_data(
-                data,
-                request.latitude,
-                request.longitude,
-                request.timezone_offset,
-                request.specific_date,
-                is_solar_car,
-                solar_car_tilt,
-                solar_car_direction
-            )
+            items = data.get("forecasts", [])
+            SolcastAPI._remember_items(key, items, time.monotonic() - age)
+            return items
+    
+    @staticmethod
+    def _store_cached_items(key: str, items: List[Dict[str, Any]]):
+        """予測データのアイテムをメモリとファイルにキャッシュする"""
+        with SolcastAPI._cache_lock:
+            SolcastAPI._remember_items(key, items, time.monotonic())
             
-        except requests.RequestException as e:
-            print(f"API通信エラー: {str(e)}")
-            return []
+            data = {"fetched_at": time.time(), "forecasts": items}
+            try:
+                os.makedirs(SolcastAPI.CACHE_DIR, exist_ok=True)
+                SolcastAPI._prune_cache_files()
+                path = os.path.join(SolcastAPI.CACHE_DIR, f"{key}.json")
+                if orjson is not None:
+                    with open(path, "wb") as f:
+                        f.write(orjson.dumps(data))
+                else:
+                    with open(path, "w", encoding="utf-8") as f:
+                        json.dump(data, f)
+            except OSError as e:
+                logger.warning("キャッシュの保存に失敗しました: %s", e)
     
     @staticmethod
-    def _calculate_sun_position(date_time: datetime, latitude: float, longitude: float) -> Dict[str, float]:
+    def _prune_cache_files():
         """
-        特定の日時と位置における太陽位置（天頂角と方位角）を計算する
-        簡易計算式を使用
+        CACHE_DIRから有効期間を過ぎたキャッシュファイルを削除する（_cache_lockを保持して呼ぶこと）
+        条件ごとにファイルが増え続けないよう、保存のたびに古いものを片付ける
         """
-        # 日付から通算日を計算
-        day_of_year = date_time.timetuple().tm_yday
+        expired_before = time.time() - SolcastAPI.CACHE_TTL
+        try:
+            with os.scandir(SolcastAPI.CACHE_DIR) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.stat().st_mtime < expired_before:
+                        SolcastAPI._remove_cache_file(entry.path)
+        except OSError as e:
+            logger.warning("キャッシュの整理に失敗しました: %s", e)
+    
+    @staticmethod
+    def _remove_cache_file(path: str):
+        """キャッシュファイルを削除する（削除できなくても処理は続ける）"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("キャッシュの削除に失敗しました: %s", e)
+    
+    @staticmethod
+    def _remember_items(key: str, items: List[Dict[str, Any]], stored_at: float):
+        """メモリ上のLRUキャッシュに追加する（_cache_lockを保持して呼ぶこと）"""
+        SolcastAPI._cache[key] = (stored_at, items)
+        SolcastAPI._cache.move_to_end(key)
+        while len(SolcastAPI._cache) > SolcastAPI.CACHE_SIZE:
+            SolcastAPI._cache.popitem(last=False)
+    
+    @staticmethod
+    def _iter_forecast_items(response: requests.Response) -> Iterable[Dict[str, Any]]:
+        """
+        レスポンスから予測データの各アイテムを順に取り出す
+        ijsonが使える場合はレスポンス全体を読み込まずに逐次パースする
+        """
+        if ijson is not None:
+            # gzip等の圧縮はurllib3側で展開させる
+            response.raw.decode_content = True
+            return ijson.items(response.raw, "forecasts.item", use_float=True)
         
-        # 時間を小数で表現（時 + 分/60 + 秒/3600）
-        hour = date_time.hour + date_time.minute/60 + date_time.second/3600
+        # 圧縮が展開された本文をまとめて読み込む
+        body = b"".join(response.iter_content(chunk_size=65536))
+        if orjson is not None:
+            return orjson.loads(body).get("forecasts", [])
+        return json.loads(body).get("forecasts", [])
+    
+    @staticmethod
+    def _parse_period_end(time_str: str) -> datetime:
+        """
+        period_end（UTC）をタイムゾーン情報なしのdatetimeに変換する
+        Solcastの固定形式（YYYY-MM-DDTHH:MM:SS.fffffffZ）は文字列の切り出しで高速に処理し、
+        それ以外の形式はdateutilでパースする
+        """
+        if len(time_str) >= 20 and time_str[10] == "T" and time_str[-1] == "Z":
+            try:
+                return datetime(
+                    int(time_str[0:4]), int(time_str[5:7]), int(time_str[8:10]),
+                    int(time_str[11:13]), int(time_str[14:16]), int(time_str[17:19])
+                )
+            except ValueError:
+                pass
         
+        time_dt = parse(time_str)
+        if time_dt.tzinfo is not None:
+            time_dt = time_dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return time_dt
+    
+    @staticmethod
+    def _calculate_sun_position(day_of_year: int, hour: float, sin_lat: float, cos_lat: float,
+                                longitude: float) -> Tuple[float, float]:
+        """
+        通算日と時刻（時 + 分/60 + 秒/3600）における太陽位置（天頂角と方位角）を計算する
+        簡易計算式を使用し、(天頂角, 方位角)のタプルを返す
+        緯度のsin/cosはリクエスト内で共通なので呼び出し側で一度だけ計算して渡す
+        """
         # 太陽赤緯の計算
-        delta = 23.45 * math.sin(math.radians(360 * (284 + day_of_year) / 365))
+        delta_rad = math.radians(23.45 * math.sin(_DECLINATION_K * (284 + day_of_year)))
         
         # 地方時と太陽時の補正（簡易版）
         time_correction = 4 * longitude  # 経度1度あたり4分の時差
         solar_time = hour + time_correction / 60
         
         # 時角の計算（15度/時間）
-        hour_angle = 15 * (solar_time - 12)
+        hour_angle_rad = math.radians(15 * (solar_time - 12))
         
         # 天頂角の計算
-        lat_rad = math.radians(latitude)
-        delta_rad = math.radians(delta)
-        hour_angle_rad = math.radians(hour_angle)
+        sin_delta = math.sin(delta_rad)
+        cos_delta = math.cos(delta_rad)
         
-        cos_zenith = (math.sin(lat_rad) * math.sin(delta_rad) + 
-                    math.cos(lat_rad) * math.cos(delta_rad) * math.cos(hour_angle_rad))
-        zenith = math.degrees(math.acos(max(min(cos_zenith, 1.0), -1.0)))
+        cos_zenith = sin_lat * sin_delta + cos_lat * cos_delta * math.cos(hour_angle_rad)
+        cos_zenith = max(min(cos_zenith, 1.0), -1.0)
+        zenith = math.degrees(math.acos(cos_zenith))
         
         # 方位角の計算
-        sin_azimuth = -math.cos(delta_rad) * math.sin(hour_angle_rad) / math.sin(math.radians(zenith))
-        cos_azimuth = (math.sin(delta_rad) - math.sin(lat_rad) * math.cos(math.radians(zenith))) / (
-                    math.cos(lat_rad) * math.sin(math.radians(zenith)))
-        
-        # 方位角の調整
-        if sin_azimuth >= 0 and cos_azimuth >= 0:
-            azimuth = math.degrees(math.asin(max(min(sin_azimuth, 1.0), -1.0)))
-        elif sin_azimuth >= 0 and cos_azimuth < 0:
-            azimuth = 180 - math.degrees(math.asin(max(min(sin_azimuth, 1.0), -1.0)))
-        elif sin_azimuth < 0 and cos_azimuth < 0:
-            azimuth = 180 - math.degrees(math.asin(max(min(sin_azimuth, 1.0), -1.0)))
-        else:
-            azimuth = 360 + math.degrees(math.asin(max(min(sin_azimuth, 1.0), -1.0)))
+        # sin/cosの共通因子(sin天頂角, cos緯度)は正なのでatan2では省略できる
+        sin_azimuth = -cos_delta * math.sin(hour_angle_rad) * cos_lat
+        cos_azimuth = sin_delta - sin_lat * cos_zenith
+        azimuth = (math.degrees(math.atan2(sin_azimuth, cos_azimuth)) + 360.0) % 360.0
         
-        return {"zenith": zenith, "azimuth": azimuth}
+        return zenith, azimuth
+    
+    @staticmethod
+    def _calculate_sun_positions_vec(day_of_year, hour, sin_lat: float, cos_lat: float, longitude: float):
+        """
+        複数時刻の太陽位置（天頂角と方位角）をまとめて計算する
+        _calculate_sun_positionと同じ簡易計算式をnumpy配列に適用する
+        """
+        # 太陽赤緯の計算
+        delta_rad = np.radians(23.45 * np.sin(_DECLINATION_K * (284 + day_of_year)))
+        
+        # 地方時と太陽時の補正（簡易版）
+        solar_time = hour + 4 * longitude / 60
+        
+        # 時角の計算（15度/時間）
+        hour_angle_rad = np.radians(15 * (solar_time - 12))
+        
+        # 天頂角の計算
+        cos_zenith = np.clip(sin_lat * np.sin(delta_rad) +
+                             cos_lat * np.cos(delta_rad) * np.cos(hour_angle_rad), -1.0, 1.0)
+        zenith = np.degrees(np.arccos(cos_zenith))
+        
+        # 方位角の計算
+        # sin/cosの共通因子(sin天頂角, cos緯度)は正なのでarctan2では省略できる
+        sin_azimuth = -np.cos(delta_rad) * np.sin(hour_angle_rad) * cos_lat
+        cos_azimuth = np.sin(delta_rad) - sin_lat * cos_zenith
+        azimuth = np.mod(np.degrees(np.arctan2(sin_azimuth, cos_azimuth)), 360.0)
+        
+        return zenith, azimuth
     
     @staticmethod
     def _calculate_gti_for_solar_car(ghi, dni, zenith, azimuth, tilt, car_direction):
@@ -169,10 +401,43 @@ class SolcastAPI:
         gti = (beam + diffuse + reflected) * car_correction
         
         return gti
+    
+    @staticmethod
+    def _calculate_gti_for_solar_car_vec(ghi, dni, zenith, azimuth, tilt: float, car_direction: float):
+        """
+        ソーラーカー用のGTIを全ての時刻についてまとめて計算する
+        _calculate_gti_for_solar_carと同じ計算をnumpy配列に適用する
+        """
+        zenith_rad = np.radians(zenith)
+        cos_zenith = np.cos(zenith_rad)
+        
+        # 傾斜角はリクエスト内で共通なので一度だけ計算
+        tilt_rad = math.radians(tilt)
+        cos_tilt = math.cos(tilt_rad)
+        sin_tilt = math.sin(tilt_rad)
+        
+        # 太陽光の入射角を計算（パネル法線と太陽光の角度）
+        cos_incidence = (cos_tilt * cos_zenith +
+                         sin_tilt * np.sin(zenith_rad) * np.cos(np.radians(azimuth - car_direction)))
+        
+        # 直達成分（入射角が90度以上なら0）
+        beam = dni * np.maximum(cos_incidence, 0)
+        
+        # 散乱成分（簡易等方性モデル）
+        diffuse = np.maximum((ghi - dni * cos_zenith) * (1 + cos_tilt) / 2, 0)
+        
+        # 地面反射成分（アルベド=0.2と仮定）
+        albedo = 0.2
+        reflected = ghi * albedo * (1 - cos_tilt) / 2
+        
+        # ソーラーカー特有の補正（走行中の揺れによる損失など）
+        car_correction = 0.95
+        
+        return (beam + diffuse + reflected) * car_correction
 
     @staticmethod
     def _process_forecast_data(
-        data: Dict[str, Any],
+        forecast_items: Iterable[Dict[str, Any]],
         latitude: float,
         longitude: float,
         timezone_offset: int = 9,
@@ -184,96 +449,155 @@ class SolcastAPI:
         """
         APIから取得したデータを処理して予測データリストを作成する
         """
-        forecasts = []
+        # 逐次パースされたアイテムも扱えるようにイテレータとして処理
+        forecast_items = iter(forecast_items)
+        first_item = next(forecast_items, None)
         
-        # APIのレスポンス構造に合わせて処理
-        forecast_items = data.get("forecasts", [])
-        
-        if not forecast_items:
-            print("予測データがありません")
+        if first_item is None:
+            logger.info("予測データがありません")
             return []
         
         # 最初のアイテムの詳細をデバッグ出力
-        if forecast_items:
-            first_item = forecast_items[0]
-            print(f"最初の予測データの詳細:")
-            for key, value in first_item.items():
-                print(f"  {key}: {value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("最初の予測データの詳細: %s", first_item)
+        
+        # 時刻の解析を先に済ませ、太陽位置はまとめて計算する
+        tz_offset = timedelta(hours=timezone_offset)
         
-        all_forecasts = []
+        # 特定の日時が指定されている場合は、時刻の解析直後に日付で絞り込み
+        # 返さない行の太陽位置計算やデータ作成を省く
+        specific_day = specific_date.date() if specific_date else None
+        if specific_date:
+            logger.debug("指定された日時: %s", specific_date)
         
-        for item in forecast_items:
+        rows = []
+        other_rows = []  # 指定日以外の行（指定日のデータがない場合のみ使う）
+        for item in itertools.chain((first_item,), forecast_items):
             # 時間の解析
             time_str = item.get("period_end")
             if not time_str:
                 continue
             
-            # UTCの時刻をパース
-            time_dt = parse(time_str)
-            
-            # 指定されたタイムゾーンに変換
-            tz_offset = timedelta(hours=timezone_offset)
-            local_time_dt = time_dt + tz_offset
+            # UTCの時刻をパースし、指定されたタイムゾーンに変換
+            local_time_dt = SolcastAPI._parse_period_end(time_str) + tz_offset
             
-            # 太陽位置の計算
-            sun_position = SolcastAPI._calculate_sun_position(local_time_dt, latitude, longitude)
-            zenith = sun_position["zenith"]
-            azimuth = sun_position["azimuth"]
+            if specific_day is not None and local_time_dt.date() != specific_day:
+                other_rows.append((item, local_time_dt))
+                continue
+            rows.append((item, local_time_dt))
+        
+        if specific_day is not None and not rows:
+            # 日付一致のデータがない場合は最も時間的に近いデータを返す
+            other_rows.sort(key=lambda row: abs((row[1] - specific_date).total_seconds()))
+            rows = other_rows[:24]  # 最大24件を返す
+        
+        # 太陽位置の取得
+        # APIが天頂角・方位角を返している行はその値を使い、欠けている行だけ計算する
+        n = len(rows)
+        zeniths = []
+        azimuths = []
+        for item, _ in rows:
+            zeniths.append(item.get("zenith"))
+            # Solcastの方位角は北=0で東が負・西が正（-180〜180）なので、北=0の時計回り（0〜360）に変換
+            api_azimuth = item.get("azimuth")
+            azimuths.append(None if api_azimuth is None else -api_azimuth % 360.0)
+        
+        missing = [i for i in range(n) if zeniths[i] is None or azimuths[i] is None]
+        if missing:
+            lat_rad = math.radians(latitude)
+            sin_lat = math.sin(lat_rad)
+            cos_lat = math.cos(lat_rad)
             
-            # GTIのデータチェック
-            gti = item.get("gti", 0.0)
-            gti_valid = "gti" in item and item["gti"] is not None
+            if np is not None:
+                times = [rows[i][1] for i in missing]
+                day_of_year = np.fromiter((t.timetuple().tm_yday for t in times), dtype=np.float64, count=len(times))
+                hour = np.fromiter((t.hour + t.minute/60 + t.second/3600 for t in times), dtype=np.float64, count=len(times))
+                zenith_arr, azimuth_arr = SolcastAPI._calculate_sun_positions_vec(
+                    day_of_year, hour, sin_lat, cos_lat, longitude
+                )
+                calculated = zip(zenith_arr.tolist(), azimuth_arr.tolist())
+            else:
+                calculated = (
+                    SolcastAPI._calculate_sun_position(
+                        t.timetuple().tm_yday, t.hour + t.minute/60 + t.second/3600, sin_lat, cos_lat, longitude
+                    )
+                    for t in (rows[i][1] for i in missing)
+                )
             
-            # ソーラーカーモードの場合は独自のGTI計算を行う
-            if is_solar_car:
-                ghi = item.get("ghi", 0)
-                dni = item.get("dni", 0)
-                # 太陽位置が計算されていることを確認
-                if zenith is not None and azimuth is not None:
-                    gti = SolcastAPI._calculate_gti_for_solar_car(
-                        ghi, dni, zenith, azimuth, solar_car_tilt, solar_car_direction
+            for i, (zenith, azimuth) in zip(missing, calculated):
+                zeniths[i] = zenith
+                azimuths[i] = azimuth
+        
+        # ソーラーカーモードの場合は独自のGTI計算をまとめて行う
+        car_gtis = None
+        if is_solar_car:
+            if np is not None:
+                ghi = np.fromiter((item.get("ghi", 0) for item, _ in rows), dtype=np.float64, count=n)
+                dni = np.fromiter((item.get("dni", 0) for item, _ in rows), dtype=np.float64, count=n)
+                # numbaのカーネルが使える場合はそちらを優先する
+                gti_func = solar_car_gti if solar_car_gti is not None else SolcastAPI._calculate_gti_for_solar_car_vec
+                car_gtis = gti_func(
+                    ghi, dni, np.array(zeniths, dtype=np.float64), np.array(azimuths, dtype=np.float64),
+                    float(solar_car_tilt), float(solar_car_direction)
+                ).tolist()
+            else:
+                car_gtis = [
+                    SolcastAPI._calculate_gti_for_solar_car(
+                        item.get("ghi", 0), item.get("dni", 0), zenith, azimuth, solar_car_tilt, solar_car_direction
                     )
-                    gti_valid = True
+                    for (item, _), zenith, azimuth in zip(rows, zeniths, azimuths)
+                ]
+        
+        # 行数は確定しているので結果のリストを先に確保しておく
+        all_forecasts = [None] * n
+        for i, (item, local_time_dt) in enumerate(rows):
+            get = item.get
+            
+            # ソーラーカーモードの場合は計算済みのGTIを使う
+            if car_gtis is not None:
+                gti = car_gtis[i]
+                gti_valid = True
+            else:
+                # GTIのデータチェック（キーの検索は1回だけ）
+                gti = get("gti")
+                gti_valid = gti is not None
+                if not gti_valid:
+                    gti = 0.0
             
             # 予測データの作成 - APIドキュメントのフィールド名を使用
             forecast = SolarForecast(
                 time=local_time_dt,
-                cloud_opacity=item.get("cloud_opacity", 0),  # クラウドの不透明度
-                wind_speed=item.get("wind_speed_10m", 0),    # 10m高さの風速
-                wind_direction=item.get("wind_direction_10m", 0),  # 10m高さの風向
-                zenith=zenith,  # 太陽天頂角
-                azimuth=azimuth,  # 太陽方位角
-                ghi=item.get("ghi", 0),  # 全天日射量
+                cloud_opacity=get("cloud_opacity", 0),  # クラウドの不透明度
+                wind_speed=get("wind_speed_10m", 0),    # 10m高さの風速
+                wind_direction=get("wind_direction_10m", 0),  # 10m高さの風向
+                zenith=zeniths[i],  # 太陽天頂角
+                azimuth=azimuths[i],  # 太陽方位角
+                ghi=get("ghi", 0),  # 全天日射量
                 gti=gti,  # 傾斜面日射量 
-                forecast_radiation=item.get("dni", 0),  # 直達日射量
+                forecast_radiation=get("dni", 0),  # 直達日射量
                 gti_valid=gti_valid,  # GTIが有効かどうか
-                air_temp=item.get("air_temp")  # 気温
+                air_temp=get("air_temp")  # 気温
             )
-            all_forecasts.append(forecast)
+            all_forecasts[i] = forecast
         
-        # 特定の日時が指定されている場合は、その日時に最も近いデータを返す
-        if specific_date:
-            # 特定日時をタイムゾーン考慮して処理
-            target_date = specific_date
-            print(f"指定された日時: {target_date}")
-            
-            # 日付が一致するデータだけをフィルタリング
-            date_filtered = [f for f in all_forecasts if (
-                f.time.year == target_date.year and 
-                f.time.month == target_date.month and 
-                f.time.day == target_date.day
-            )]
-            
-            if date_filtered:
-                # 時間が近いものを優先的に選択
-                date_filtered.sort(key=lambda x: abs((x.time.hour * 60 + x.time.minute) - 
-                                                    (target_date.hour * 60 + target_date.minute)))
-                forecasts = date_filtered
-            else:
-                # 日付一致のデータがない場合は最も時間的に近いデータを返す
-                all_forecasts.sort(key=lambda x: abs((x.time - target_date).total_seconds()))
-                forecasts = all_forecasts[:24]  # 最大24件を返す
-        else:
-            forecasts = all_forecasts
+        return SolcastAPI._sort_by_time(all_forecasts)
     
+    @staticmethod
+    def _sort_by_time(forecasts: List[SolarForecast]) -> List[SolarForecast]:
+        """
+        予測データを時刻順に並べる
+        APIのデータは通常すでに時刻順なので、その場合は並べ替えを省略する
+        """
+        if len(forecasts) < 2:
+            return forecasts
+        
+        if np is not None:
+            times = np.array([f.time for f in forecasts], dtype="datetime64[us]")
+            if np.all(times[1:] >= times[:-1]):
+                return forecasts
+            order = np.argsort(times, kind="stable")
+            return [forecasts[i] for i in order.tolist()]
+        
+        if all(a.time <= b.time for a, b in zip(forecasts, forecasts[1:])):
+            return forecasts
         return sorted(forecasts, key=lambda x: x.time)
\ No newline at end of file
@@ -1,31 +1,243 @@
+import functools
+import logging
+import operator
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox
 import threading
 import time
 from datetime import datetime, timedelta
-from typing import List, Callable, Optional
+from typing import Dict, List, Callable, Iterable, Optional, Tuple
 
 from models import SolarForecast, ForecastRequest
-from config import Config
+from config import Config, config as app_config
 from solcast_api import SolcastAPI
 
+logger = logging.getLogger(__name__)
+
+# 表示内容はText.insertにそのまま渡せる（文字列, タグ, 文字列, タグ, ...）の並びで組み立てる
+# 区切り線はワーカースレッドの時点でタグ付きの改行として入れておき、メインスレッドでは加工しない
+_Segments = Tuple[str, ...]
+
+# 予測データ間の区切り線（_SEP_TAGを付けた改行を細い横線として表示する）
+_SEP_TAG = "sep"
+_ROW_SEP: _Segments = ("", "\n", _SEP_TAG)
+
+# 結果表示の先頭に出す共通の注記
+_AVAILABLE_DATA_NOTE = (
+    "※ 利用可能なデータ: 日時、全天日射量(GHI)、直達日射量(DNI)、気温\n"
+    "※ 太陽位置(天頂角・方位角)はAPIから取得できない場合のみ計算値です\n"
+)
+_GTI_SETTING_NOTE = "※ GTIを表示するには傾斜角と方位角を設定してください\n"
+_SOLAR_CAR_NOTE = (
+    "※ ソーラーカーモードでは走行中の姿勢変化を近似した計算を行います\n"
+    "※ 実際の値は走行条件によって変動する可能性があります\n"
+)
+
+# 別ウィンドウ表示時にメインウィンドウの概要ラベルへ出すテンプレート
+_SUMMARY_TEMPLATE = "詳細は別ウィンドウに表示中 ({count}件, UTC{tz_sign}{tz}){panel_info}"
+
+# 予測データ1件分の表示テンプレート（データ期間・気温は値がある場合のみ行を出す）
+_ROW_TEMPLATE = (
+    "日時: {time}\n"
+    "{period}"
+    "{air_temp}"
+    "全天日射量(GHI): {ghi:.2f} W/m²\n"
+    "予測照射量/直達日射量(DNI): {dni:.2f} W/m²\n"
+    "{gti_line}"
+    "太陽天頂角: {zenith:.2f}°\n"
+    "太陽方位角: {azimuth:.2f}°\n"
+)
+
+# GTIの表示内容ごとに書式化メソッドを用意しておく（行ごとにGTIの文字列を組み立てない）
+_FORMAT_ROW_WITH_GTI = _ROW_TEMPLATE.replace("{gti_line}", "全天傾斜日射量(GTI): {gti:.2f} W/m²\n").format
+_FORMAT_ROW_GTI_MISSING = _ROW_TEMPLATE.replace("{gti_line}", "全天傾斜日射量(GTI): データなし\n").format
+_FORMAT_ROW_GTI_UNSET = _ROW_TEMPLATE.replace("{gti_line}", "全天傾斜日射量(GTI): 設定が必要\n").format
+
+
+# 予測データが取得できなかったときの案内文
+_NO_DATA_TEXT = (
+    "予測データが見つかりませんでした\n\n"
+    "考えられる原因:\n"
+    "・指定された位置情報が正しくない\n"
+    "・APIキーが無効または上限に達している\n"
+    "・API呼び出しが失敗した\n"
+    "\nパラメータを調整して再試行してください\n"
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _compose_header(panel_type: str, has_gti_params: bool, specific_time_str: str,
+                    tilt: str, azimuth: str, solar_tilt: str, solar_dir: str) -> str:
+    """予測データ一覧の先頭に表示する注記部分を組み立てる"""
+    lines = []
+    
+    # 時刻指定されていた場合の注記
+    if specific_time_str:
+        lines.append(f"※ 指定日時: {specific_time_str} の近くのデータを表示しています\n")
+    
+    # 利用可能なデータに関する注記を表示
+    lines.append(_AVAILABLE_DATA_NOTE)
+    
+    # パネル設定の説明を追加
+    panel_info = ""
+    
+    if panel_type == "fixed":
+        panel_info = f"固定パネル設定: 傾斜角={tilt or 'なし'}, 方位角={azimuth or 'なし'}"
+    elif panel_type == "horizontal_single_axis":
+        panel_info = f"水平一軸追尾型パネル設定: 軸方位角={azimuth or 'なし'}"
+    elif panel_type == "solar_car":
+        panel_info = f"ソーラーカー設定: 初期傾斜角={solar_tilt}°, 走行方位角={solar_dir}°"
+    
+    if panel_info:
+        lines.append(f"※ {panel_info}\n")
+    
+    if panel_type == "solar_car":
+        lines.append(_SOLAR_CAR_NOTE)
+    
+    if not has_gti_params:
+        lines.append(_GTI_SETTING_NOTE)
+    
+    lines.append("\n")
+    return "".join(lines)
+
+
+# 時刻文字列（HH:MM:SS）のキャッシュ。一定件数を超えたら破棄する
+_HMS_CACHE: Dict[Tuple[int, int, int], str] = {}
+_HMS_CACHE_SIZE = 4096
+
+
+def _hms(dt: datetime) -> str:
+    """時刻を'%H:%M:%S'形式の文字列にする（同じ時刻はキャッシュを返す）"""
+    key = (dt.hour, dt.minute, dt.second)
+    value = _HMS_CACHE.get(key)
+    if value is None:
+        if len(_HMS_CACHE) >= _HMS_CACHE_SIZE:
+            _HMS_CACHE.clear()
+        value = _HMS_CACHE[key] = f"{dt.hour:02}:{dt.minute:02}:{dt.second:02}"
+    return value
+
+
+def _format_datetimes(times: Iterable[datetime]) -> List[str]:
+    """日時を'%Y-%m-%d %H:%M'形式の文字列にまとめて変換する（strftimeより速い）"""
+    return [f"{t.year}-{t.month:02}-{t.day:02} {t.hour:02}:{t.minute:02}" for t in times]
+
+
+# 表示に使う予測データの項目（1回の呼び出しでまとめて取り出す）
+_ROW_FIELDS = operator.attrgetter(
+    "period", "air_temp", "ghi", "forecast_radiation", "gti", "gti_valid", "zenith", "azimuth")
+
+
+def _render_rows(forecasts: List[SolarForecast], times: List[str], has_gti_params: bool) -> List[str]:
+    """予測データ一覧の表示内容を、各行の後に区切り線を挟んだ_Segmentsの並びとして返す
+    
+    各行の項目はattrgetterでタプルとしてまとめて取り出し、行ごとの属性参照を減らす
+    """
+    # GTIの値がない行の書式（一覧全体で共通）
+    format_with_gti = _FORMAT_ROW_WITH_GTI
+    format_without_gti = _FORMAT_ROW_GTI_MISSING if has_gti_params else _FORMAT_ROW_GTI_UNSET
+    
+    segments: List[str] = []
+    for time_str, (period, air_temp, ghi, dni, gti, gti_valid, zenith, azimuth) in zip(
+            times, map(_ROW_FIELDS, forecasts)):
+        segments.append((format_with_gti if gti_valid else format_without_gti)(
+            time=time_str,
+            period=f"データ期間: {period}\n" if period else "",
+            air_temp=f"気温: {air_temp}℃\n" if air_temp is not None else "",
+            ghi=ghi,
+            dni=dni,
+            gti=gti,
+            zenith=zenith,
+            azimuth=azimuth,
+        ))
+        segments += _ROW_SEP
+    return segments
+
+
+def _display_count(settings: dict, total: int) -> int:
+    """表示設定の表示件数を1件以上、取得件数以下に収めて返す（数値でなければ3件）"""
+    try:
+        display_count = int(settings.get("display_count", 3))
+    except ValueError:
+        return 3  # デフォルト値
+    if display_count <= 0:
+        return 1
+    return min(display_count, total)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_request(latitude: float, longitude: float, hours: int, api_key: str,
+                   specific_date: Optional[datetime], timezone_offset: int,
+                   tilt: Optional[float], azimuth: Optional[float], array_type: str, interval: int,
+                   is_solar_car: bool, solar_car_tilt: float, solar_car_direction: float) -> ForecastRequest:
+    """予測リクエストを作成する（同じ条件での再取得では前回のインスタンスを使い回す）"""
+    return ForecastRequest(
+        latitude=latitude,
+        longitude=longitude,
+        hours=hours,
+        api_key=api_key,
+        specific_date=specific_date,
+        timezone_offset=timezone_offset,
+        tilt=tilt,
+        azimuth=azimuth,
+        array_type=array_type,
+        interval=interval,
+        is_solar_car=is_solar_car,
+        solar_car_tilt=solar_car_tilt,
+        solar_car_direction=solar_car_direction
+    )
+
+
+def _create_result_text(parent, **pack_options) -> tk.Text:
+    """読み取り専用の結果表示用テキストエリアを縦スクロールバー付きで作成する"""
+    frame = ttk.Frame(parent)
+    frame.pack(fill=tk.BOTH, expand=True, **pack_options)
+    
+    scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    
+    # 表示専用なので編集履歴は持たず、書き込み時以外は編集不可にしておく
+    text = tk.Text(frame, wrap=tk.WORD, undo=False, autoseparators=False, maxundo=0,
+                   state=tk.DISABLED, yscrollcommand=scrollbar.set)
+    text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    scrollbar.configure(command=text.yview)
+    
+    # 区切り線は文字ではなく、改行に付けたタグの背景色で細い横線として描く
+    text.tag_configure(_SEP_TAG, background="#c0c0c0", font=("TkDefaultFont", 1))
+    return text
+
+
+def _replace_text(widget: tk.Text, segments: _Segments):
+    """読み取り専用のテキストエリアの内容をまとめて差し替える"""
+    widget.configure(state=tk.NORMAL)
+    # 大量のテキストを書き込むため、tkinterのラッパーを介さずTclのコマンドを直接呼ぶ
+    widget.tk.call(widget._w, "delete", "1.0", "end")
+    if segments:
+        widget.tk.call(widget._w, "insert", "end", *segments)
+    widget.configure(state=tk.DISABLED)
+    widget.see(1.0)
+    # 表示専用なので編集履歴は残さない
+    widget.edit_reset()
+
 
 class ResultWindow:
     """予測結果を表示する別ウィンドウクラス"""
     
     def __init__(self, parent, title="予測結果詳細"):
         self.window = tk.Toplevel(parent)
+        self.title = title
         self.window.title(title)
         self.window.geometry("700x500")
         self.window.minsize(600, 400)
         
-        # ウィンドウが閉じられたときのフラグ
-        self.is_closed = False
+        # 閉じられても破棄せずに隠し、次回の表示で再利用する
         self.window.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # 結果表示用テキストエリア
-        self.result_text = scrolledtext.ScrolledText(self.window, wrap=tk.WORD)
-        self.result_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.result_text = _create_result_text(self.window, padx=10, pady=10)
+        
+        # 前回表示したテキストのハッシュ（同じ内容なら書き換えない）
+        self._last_render_hash: Optional[int] = None
         
         # ボタンフレーム
         button_frame = ttk.Frame(self.window)
@@ -34,70 +246,57 @@ class ResultWindow:
         # 閉じるボタン
         ttk.Button(button_frame, text="閉じる", command=self._on_close).pack(side=tk.RIGHT)
     
-    def display_forecasts(self, forecasts, timezone_offset, display_count, has_gti_params=False, use_specific_time=False, specific_time_str=""):
-        """予測データを表示"""
-        self.result_text.delete(1.0, tk.END)
+    def show(self, title: str):
+        """隠しているウィンドウを再表示してタイトルを更新"""
+        if title != self.title:
+            self.title = title
+            self.window.title(title)
+        self.window.deiconify()
+    
+    def display_text(self, segments: _Segments):
+        """組み立て済みの表示内容を表示"""
+        text_hash = hash(segments)
+        if text_hash != self._last_render_hash:
+            _replace_text(self.result_text, segments)
+            self._last_render_hash = text_hash
         
+        # ウィンドウを前面に表示
+        self.window.lift()
+    
+    @staticmethod
+    def format_forecasts(forecasts, timezone_offset, display_count, has_gti_params=False, use_specific_time=False, specific_time_str="") -> _Segments:
+        """別ウィンドウに表示する内容を組み立てる（Tkを使わないためワーカースレッドからも呼べる）"""
         tz_sign = "+" if timezone_offset >= 0 else ""
         
         if not forecasts:
-            self.result_text.insert(tk.END, "予測データが見つかりませんでした\n")
-            return
+            return ("予測データが見つかりませんでした\n",)
         
         # 表示するデータを制限
         display_forecasts = forecasts[:display_count]
         
-        self.result_text.insert(tk.END, f"予測データ詳細 - 表示: {len(display_forecasts)}件 / 取得: {len(forecasts)}件 (UTC{tz_sign}{timezone_offset})\n\n")
+        # 表示内容をまとめてから1回で挿入する
+        parts = []
+        parts.append(f"予測データ詳細 - 表示: {len(display_forecasts)}件 / 取得: {len(forecasts)}件 (UTC{tz_sign}{timezone_offset})\n\n")
         
         # 時刻指定されていた場合の注記
         if use_specific_time and specific_time_str:
-            self.result_text.insert(tk.END, f"※ 指定日時: {specific_time_str} の近くのデータを表示しています\n")
+            parts.append(f"※ 指定日時: {specific_time_str} の近くのデータを表示しています\n")
         
         # 利用可能なデータに関する注記を表示
-        self.result_text.insert(tk.END, "※ 利用可能なデータ: 日時、全天日射量(GHI)、直達日射量(DNI)、気温\n")
-        self.result_text.insert(tk.END, "※ 太陽位置(天頂角・方位角)は計算値です\n")
+        parts.append(_AVAILABLE_DATA_NOTE)
         
         if not has_gti_params:
-            self.result_text.insert(tk.END, "※ GTIを表示するには傾斜角と方位角を設定してください\n")
+            parts.append(_GTI_SETTING_NOTE)
         
-        self.result_text.insert(tk.END, "\n")
-        
-        for forecast in display_forecasts:
-            self.result_text.insert(tk.END, f"日時: {forecast.time.strftime('%Y-%m-%d %H:%M')}\n")
-            
-            # データ期間がある場合は表示
-            if hasattr(forecast, 'period') and forecast.period:
-                self.result_text.insert(tk.END, f"データ期間: {forecast.period}\n")
-            
-            # 気温データがあれば表示
-            if hasattr(forecast, "air_temp") and forecast.air_temp is not None:
-                self.result_text.insert(tk.END, f"気温: {forecast.air_temp}℃\n")
-            
-            # APIから取得できる値のみ表示
-            self.result_text.insert(tk.END, f"全天日射量(GHI): {forecast.ghi:.2f} W/m²\n")
-            self.result_text.insert(tk.END, f"予測照射量/直達日射量(DNI): {forecast.forecast_radiation:.2f} W/m²\n")
-            
-            # GTIの表示
-            if hasattr(forecast, "gti_valid") and forecast.gti_valid:
-                self.result_text.insert(tk.END, f"全天傾斜日射量(GTI): {forecast.gti:.2f} W/m²\n")
-            elif has_gti_params:
-                self.result_text.insert(tk.END, "全天傾斜日射量(GTI): データなし\n")
-            else:
-                self.result_text.insert(tk.END, "全天傾斜日射量(GTI): 設定が必要\n")
-            
-            # 太陽位置情報（計算値）
-            self.result_text.insert(tk.END, f"太陽天頂角: {forecast.zenith:.2f}°\n")
-            self.result_text.insert(tk.END, f"太陽方位角: {forecast.azimuth:.2f}°\n")
-            
-            self.result_text.insert(tk.END, "-" * 50 + "\n")
+        parts.append("\n")
         
-        # ウィンドウを前面に表示
-        self.window.lift()
+        # 日時の文字列化は先にまとめて行い、各行はまとめて組み立てる
+        times = _format_datetimes(forecast.time for forecast in display_forecasts)
+        return ("".join(parts), "", *_render_rows(display_forecasts, times, has_gti_params))
     
     def _on_close(self):
-        """ウィンドウが閉じられたときの処理"""
-        self.is_closed = True
-        self.window.destroy()
+        """ウィンドウが閉じられたときの処理（破棄せずに隠す）"""
+        self.window.withdraw()
 
 
 class SolcastApp:
@@ -105,6 +304,15 @@ class SolcastApp:
     # デフォルトの最小待機時間（秒）
     DEFAULT_REQUEST_INTERVAL = 30
     
+    # 取得前に検証する数値入力（変数名, 型, 最小値, 最大値, 範囲外のときのメッセージ）
+    # DoubleVar/IntVarはTclが"08"などを8進数として解釈しエラーになるため、StringVarをPython側で変換する
+    _FIELDS = (
+        ("latitude_var", float, -90, 90, "緯度は-90から90の間で入力してください"),
+        ("longitude_var", float, -180, 180, "経度は-180から180の間で入力してください"),
+        ("hours_var", int, 1, 168, "予測時間は1から168の間で入力してください"),
+        ("timezone_var", int, -12, 14, "タイムゾーンは-12から+14の間で入力してください"),
+    )
+    
     def __init__(self, root, panel_help=None):
         self.root = root
         self.root.title("Solcast太陽光予測モニター")
@@ -117,25 +325,40 @@ class SolcastApp:
             "horizontal_single_axis": "水平一軸追尾型"
         }
         
-        # Configインスタンスを作成
-        self.config = Config.load()
+        # アプリケーション共有のConfigインスタンスを使う
+        self.config = app_config
         self.forecasts: List[SolarForecast] = []
         
         # 最小待機時間を設定
         self.MIN_REQUEST_INTERVAL = int(self.config.get("api_cooltime", 30))
         
-        # 最後のリクエスト時刻を記録
-        self.last_request_time = datetime.min
+        # 最後のリクエスト時刻を記録（time.monotonicの値。初回は必ず取得できるよう-inf）
+        self.last_request_time = float("-inf")
         
         # 別ウィンドウ表示のオプション
         self.use_separate_window_var = tk.BooleanVar(value=False)
         self.result_window = None
         
+        # 別ウィンドウのタイトルは分単位なので、同じ分の間は使い回す
+        self._last_title_minute: Optional[datetime] = None
+        self._last_title_str = ""
+        
+        # 前回表示したテキストのハッシュ（同じ内容なら書き換えない）
+        self._last_render_hash: Optional[int] = None
+        
+        # 前回表示テキストを組み立てたときの予測データ・表示設定と、その結果
+        self._last_display_key: Optional[tuple] = None
+        self._last_display_texts: Tuple[_Segments, str, Optional[_Segments]] = ((), "", None)
+        
         self._create_widgets()
         self._load_saved_settings()
     
     def _create_widgets(self):
         """UIウィジェットを作成する"""
+        # 数値入力欄のキー入力チェック（数値にならない入力はその場で受け付けない）
+        float_vcmd = (self.root.register(self._validate_float), "%P")
+        int_vcmd = (self.root.register(self._validate_int), "%P")
+        
         # メインフレーム
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -181,15 +404,18 @@ class SolcastApp:
         
         ttk.Label(location_frame, text="緯度:").pack(side=tk.LEFT)
         self.latitude_var = tk.StringVar()
-        ttk.Entry(location_frame, textvariable=self.latitude_var, width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Entry(location_frame, textvariable=self.latitude_var, width=10,
+                  validate="key", validatecommand=float_vcmd).pack(side=tk.LEFT, padx=5)
         
         ttk.Label(location_frame, text="経度:").pack(side=tk.LEFT, padx=(10, 0))
         self.longitude_var = tk.StringVar()
-        ttk.Entry(location_frame, textvariable=self.longitude_var, width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Entry(location_frame, textvariable=self.longitude_var, width=10,
+                  validate="key", validatecommand=float_vcmd).pack(side=tk.LEFT, padx=5)
         
         ttk.Label(location_frame, text="予測時間(時間):").pack(side=tk.LEFT, padx=(10, 0))
         self.hours_var = tk.StringVar()
-        ttk.Entry(location_frame, textvariable=self.hours_var, width=5).pack(side=tk.LEFT, padx=5)
+        ttk.Entry(location_frame, textvariable=self.hours_var, width=5,
+                  validate="key", validatecommand=int_vcmd).pack(side=tk.LEFT, padx=5)
         
         # データ間隔設定を追加
         interval_frame = ttk.Frame(input_frame)
@@ -244,24 +470,39 @@ class SolcastApp:
             command=self._toggle_time_inputs
         ).pack(side=tk.LEFT)
         
-        # 日付入力
+        # 日付入力（初期値は現在日時。datetime.now()は1回だけ呼ぶ）
+        now = datetime.now()
         ttk.Label(time_frame, text="日付:").pack(side=tk.LEFT, padx=(10, 0))
-        self.year_var = tk.StringVar(value=datetime.now().strftime("%Y"))
-        ttk.Entry(time_frame, textvariable=self.year_var, width=5).pack(side=tk.LEFT)
+        self.year_var = tk.StringVar(value=f"{now.year:04d}")
+        self.year_entry = ttk.Entry(time_frame, textvariable=self.year_var, width=5,
+                                    validate="key", validatecommand=int_vcmd)
+        self.year_entry.pack(side=tk.LEFT)
         ttk.Label(time_frame, text="/").pack(side=tk.LEFT)
-        self.month_var = tk.StringVar(value=datetime.now().strftime("%m"))
-        ttk.Entry(time_frame, textvariable=self.month_var, width=3).pack(side=tk.LEFT)
+        self.month_var = tk.StringVar(value=f"{now.month:02d}")
+        self.month_entry = ttk.Entry(time_frame, textvariable=self.month_var, width=3,
+                                     validate="key", validatecommand=int_vcmd)
+        self.month_entry.pack(side=tk.LEFT)
         ttk.Label(time_frame, text="/").pack(side=tk.LEFT)
-        self.day_var = tk.StringVar(value=datetime.now().strftime("%d"))
-        ttk.Entry(time_frame, textvariable=self.day_var, width=3).pack(side=tk.LEFT)
+        self.day_var = tk.StringVar(value=f"{now.day:02d}")
+        self.day_entry = ttk.Entry(time_frame, textvariable=self.day_var, width=3,
+                                   validate="key", validatecommand=int_vcmd)
+        self.day_entry.pack(side=tk.LEFT)
         
         # 時刻入力
         ttk.Label(time_frame, text="時刻:").pack(side=tk.LEFT, padx=(10, 0))
-        self.hour_var = tk.StringVar(value=datetime.now().strftime("%H"))
-        ttk.Entry(time_frame, textvariable=self.hour_var, width=3).pack(side=tk.LEFT)
+        self.hour_var = tk.StringVar(value=f"{now.hour:02d}")
+        self.hour_entry = ttk.Entry(time_frame, textvariable=self.hour_var, width=3,
+                                    validate="key", validatecommand=int_vcmd)
+        self.hour_entry.pack(side=tk.LEFT)
         ttk.Label(time_frame, text=":").pack(side=tk.LEFT)
         self.minute_var = tk.StringVar(value="00")
-        ttk.Entry(time_frame, textvariable=self.minute_var, width=3).pack(side=tk.LEFT)
+        self.minute_entry = ttk.Entry(time_frame, textvariable=self.minute_var, width=3,
+                                      validate="key", validatecommand=int_vcmd)
+        self.minute_entry.pack(side=tk.LEFT)
+        
+        # 時刻指定の切り替えで有効/無効にする入力欄（固定なのでタプルで持つ）
+        self._time_entries = (self.year_entry, self.month_entry, self.day_entry,
+                              self.hour_entry, self.minute_entry)
         
         # 初期状態で時刻指定関連のウィジェットを無効化
         self._toggle_time_inputs()
@@ -310,11 +551,13 @@ class SolcastApp:
         
         ttk.Label(self.solar_car_frame, text="初期傾斜角(度):").pack(side=tk.LEFT)
         self.solar_car_tilt_var = tk.StringVar(value="10")
-        ttk.Entry(self.solar_car_frame, textvariable=self.solar_car_tilt_var, width=5).pack(side=tk.LEFT, padx=5)
+        ttk.Entry(self.solar_car_frame, textvariable=self.solar_car_tilt_var, width=5,
+                  validate="key", validatecommand=float_vcmd).pack(side=tk.LEFT, padx=5)
         
         ttk.Label(self.solar_car_frame, text="走行方位角(度):").pack(side=tk.LEFT, padx=(10, 0))
         self.solar_car_direction_var = tk.StringVar(value="180")
-        ttk.Entry(self.solar_car_frame, textvariable=self.solar_car_direction_var, width=5).pack(side=tk.LEFT, padx=5)
+        ttk.Entry(self.solar_car_frame, textvariable=self.solar_car_direction_var, width=5,
+                  validate="key", validatecommand=float_vcmd).pack(side=tk.LEFT, padx=5)
         
         ttk.Label(self.solar_car_frame, text="※ソーラーカーの走行方向: 0=北, 90=東, 180=南, 270=西").pack(side=tk.LEFT, padx=(5, 0))
         
@@ -327,34 +570,49 @@ class SolcastApp:
         
         ttk.Label(panel_params_frame, text="傾斜角(度):").pack(side=tk.LEFT)
         self.tilt_var = tk.StringVar()
-        self.tilt_entry = ttk.Entry(panel_params_frame, textvariable=self.tilt_var, width=5)
+        self.tilt_entry = ttk.Entry(panel_params_frame, textvariable=self.tilt_var, width=5,
+                                    validate="key", validatecommand=float_vcmd)
         self.tilt_entry.pack(side=tk.LEFT, padx=5)
         
         ttk.Label(panel_params_frame, text="方位角(度):").pack(side=tk.LEFT, padx=(10, 0))
         ttk.Label(panel_params_frame, text="0=北、90=東、180=南、270=西").pack(side=tk.LEFT, padx=(0, 10))
         self.panel_azimuth_var = tk.StringVar()
-        self.azimuth_entry = ttk.Entry(panel_params_frame, textvariable=self.panel_azimuth_var, width=5)
+        self.azimuth_entry = ttk.Entry(panel_params_frame, textvariable=self.panel_azimuth_var, width=5,
+                                       validate="key", validatecommand=float_vcmd)
         self.azimuth_entry.pack(side=tk.LEFT, padx=5)
         
         # 表示フレーム
         display_frame = ttk.LabelFrame(main_frame, text="予測結果")
         display_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
+        # 別ウィンドウ表示時の概要（空のラベルでも1行分の高さを取るため、表示するときだけ配置する）
+        self.summary_var = tk.StringVar()
+        self.summary_label = ttk.Label(display_frame, textvariable=self.summary_var, justify=tk.LEFT)
+        
         # テキスト表示のみ
-        self.result_text = scrolledtext.ScrolledText(display_frame, wrap=tk.WORD)
-        self.result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.result_text = _create_result_text(display_frame, padx=5, pady=5)
+    
+    @staticmethod
+    def _validate_float(value: str) -> bool:
+        """入力途中の値も含め、実数として入力できる文字列か判定する"""
+        if value in ("", "-", ".", "-."):
+            return True
+        try:
+            float(value)
+            return True
+        except ValueError:
+            return False
+    
+    @staticmethod
+    def _validate_int(value: str) -> bool:
+        """0以上の整数として入力できる文字列か判定する"""
+        return value == "" or value.isdigit()
     
     def _toggle_time_inputs(self):
         """時刻入力フィールドの有効/無効を切り替える"""
         state = "normal" if self.use_specific_time_var.get() else "disabled"
-        for var_name in ["year_var", "month_var", "day_var", "hour_var", "minute_var"]:
-            for widget in self.root.winfo_children():
-                if hasattr(self, var_name):
-                    for child in widget.winfo_children():
-                        if isinstance(child, ttk.Frame):
-                            for grandchild in child.winfo_children():
-                                if isinstance(grandchild, ttk.Entry) and grandchild.cget("textvariable") == getattr(self, var_name).name:
-                                    grandchild.configure(state=state)
+        for entry in self._time_entries:
+            entry.configure(state=state)
     
     def _load_saved_settings(self):
         """保存された設定を読み込む"""
@@ -370,9 +628,7 @@ class SolcastApp:
         """API Keyを保存する"""
         api_key = self.api_key_var.get().strip()
         if api_key:
-            # Config.save_api_key(api_key) の代わりに：
-            self.config.set("api_key", api_key)
-            self.config.save()
+            Config.save_api_key(api_key)
             messagebox.showinfo("情報", "API Keyを保存しました")
         else:
             messagebox.showerror("エラー", "API Keyを入力してください")
@@ -399,64 +655,52 @@ class SolcastApp:
     def _fetch_forecast(self):
         """予測データを取得する（レート制限考慮）"""
         # 入力チェック
-        try:
-            latitude = float(self.latitude_var.get())
-            longitude = float(self.longitude_var.get())
-            hours = int(self.hours_var.get())
-            api_key = self.api_key_var.get().strip()
-            timezone_offset = int(self.timezone_var.get())
-            
-            # タイムゾーンの妥当性チェック
-            if not (-12 <= timezone_offset <= 14):
-                messagebox.showerror("エラー", "タイムゾーンは-12から+14の間で入力してください")
+        api_key = self.api_key_var.get().strip()
+        if not api_key:
+            messagebox.showerror("エラー", "API Keyを入力してください")
+            return
+        
+        values = []
+        for var_name, caster, low, high, message in self._FIELDS:
+            try:
+                value = caster(getattr(self, var_name).get())
+            except ValueError:
+                messagebox.showerror("エラー", "正しい数値を入力してください")
                 return
-            
-            if not api_key:
-                messagebox.showerror("エラー", "API Keyを入力してください")
+            if not (low <= value <= high):
+                messagebox.showerror("エラー", message)
                 return
+            values.append(value)
+        latitude, longitude, hours, timezone_offset = values
+        
+        # 特定時刻の処理
+        specific_date = None
+        if self.use_specific_time_var.get():
+            try:
+                year = int(self.year_var.get())
+                month = int(self.month_var.get())
+                day = int(self.day_var.get())
+                hour = int(self.hour_var.get())
+                minute = int(self.minute_var.get())
                 
-            if not (-90 <= latitude <= 90):
-                messagebox.showerror("エラー", "緯度は-90から90の間で入力してください")
-                return
+                specific_date = datetime(year, month, day, hour, minute)
                 
-            if not (-180 <= longitude <= 180):
-                messagebox.showerror("エラー", "経度は-180から180の間で入力してください")
-                return
+                # 時刻指定に関する情報メッセージ
+                messagebox.showinfo("情報", "指定された日時に最も近い予測データを表示します。")
                 
-            if hours <= 0 or hours > 168:
-                messagebox.showerror("エラー", "予測時間は1から168の間で入力してください")
+            except ValueError:
+                messagebox.showerror("エラー", "日付と時刻の形式が正しくありません")
                 return
-            
-            # 特定時刻の処理
-            specific_date = None
-            if self.use_specific_time_var.get():
-                try:
-                    year = int(self.year_var.get())
-                    month = int(self.month_var.get())
-                    day = int(self.day_var.get())
-                    hour = int(self.hour_var.get())
-                    minute = int(self.minute_var.get())
-                    
-                    specific_date = datetime(year, month, day, hour, minute)
-                    
-                    # 時刻指定に関する情報メッセージ
-                    messagebox.showinfo("情報", "指定された日時に最も近い予測データを表示します。")
-                    
-                except ValueError:
-                    messagebox.showerror("エラー", "日付と時刻の形式が正しくありません")
-                    return
-        
-        except ValueError:
-            messagebox.showerror("エラー", "正しい数値を入力してください")
-            return
         
         # パネルパラメータ取得
         array_type = self.array_type_var.get()
+        tilt_str = self.tilt_var.get()
+        panel_azimuth_str = self.panel_azimuth_var.get()
         
         tilt = None
-        if array_type == "fixed" and self.tilt_var.get():
+        if array_type == "fixed" and tilt_str:
             try:
-                tilt = float(self.tilt_var.get())
+                tilt = float(tilt_str)
                 if not (0 <= tilt <= 90):
                     messagebox.showerror("エラー", "傾斜角は0から90の間で入力してください")
                     return
@@ -465,9 +709,9 @@ class SolcastApp:
                 return
         
         panel_azimuth = None
-        if self.panel_azimuth_var.get():
+        if panel_azimuth_str:
             try:
-                panel_azimuth = float(self.panel_azimuth_var.get())
+                panel_azimuth = float(panel_azimuth_str)
                 if not (0 <= panel_azimuth <= 360):
                     messagebox.showerror("エラー", "方位角は0から360の間で入力してください")
                     return
@@ -476,8 +720,8 @@ class SolcastApp:
                 return
         
         # レート制限のチェック
-        now = datetime.now()
-        time_since_last_request = (now - self.last_request_time).total_seconds()
+        now = time.monotonic()
+        time_since_last_request = now - self.last_request_time
         
         if time_since_last_request < self.MIN_REQUEST_INTERVAL:
             # 前回のリクエストから十分な時間が経過していない場合
@@ -504,11 +748,14 @@ class SolcastApp:
             self.hours_var.set(str(max_hours))
             messagebox.showinfo("情報", f"選択された間隔では最大{max_hours}時間までのデータを取得します")
         
+        # 表示用の設定はTk変数を読むためメインスレッドで取得しておく
+        display_settings = self._get_display_settings()
+        
         # バックグラウンドでAPIリクエスト実行
         thread = threading.Thread(
             target=self._background_fetch, 
             args=(latitude, longitude, hours, api_key, specific_date, timezone_offset, 
-                  array_type, tilt, panel_azimuth, interval)
+                  array_type, tilt, panel_azimuth, interval, display_settings)
         )
         thread.daemon = True
         thread.start()
@@ -517,8 +764,10 @@ class SolcastApp:
                    api_key: str, specific_date: Optional[datetime] = None,
                    timezone_offset: int = 9, array_type: str = "fixed",
                    tilt: Optional[float] = None, panel_azimuth: Optional[float] = None,
-                   interval: int = 30):
+                   interval: int = 30, display_settings: Optional[dict] = None):
         """バックグラウンドでのデータ取得処理"""
+        display_settings = display_settings or {}
+        
         # ソーラーカーモードのフラグ
         is_solar_car = array_type == "solar_car"
         solar_car_tilt = 10.0
@@ -527,9 +776,11 @@ class SolcastApp:
         # ソーラーカーモードの場合のパラメータ調整
         if is_solar_car:
             try:
-                # ソーラーカーモード用の値を取得
-                solar_car_tilt = float(self.solar_car_tilt_var.get()) if self.solar_car_tilt_var.get() else 10.0
-                solar_car_direction = float(self.solar_car_direction_var.get()) if self.solar_car_direction_var.get() else 180.0
+                # ソーラーカーモード用の値を取得（メインスレッドで読み取った値を使う）
+                solar_car_tilt_str = display_settings.get("solar_car_tilt", "")
+                solar_car_direction_str = display_settings.get("solar_car_direction", "")
+                solar_car_tilt = float(solar_car_tilt_str) if solar_car_tilt_str else 10.0
+                solar_car_direction = float(solar_car_direction_str) if solar_car_direction_str else 180.0
                 
                 # API用にパラメータを設定 - 標準APIリクエストには固定パネルとして送信
                 array_type = "fixed"
@@ -541,185 +792,190 @@ class SolcastApp:
                 tilt = 10.0
                 panel_azimuth = 180.0
         
-        request = ForecastRequest(
-            latitude=latitude,
-            longitude=longitude,
-            hours=hours,
-            api_key=api_key,
-            specific_date=specific_date,
-            timezone_offset=timezone_offset,
-            tilt=tilt,
-            azimuth=panel_azimuth,
-            array_type=array_type,
-            interval=interval,
-            is_solar_car=is_solar_car,
-            solar_car_tilt=solar_car_tilt,
-            solar_car_direction=solar_car_direction
+        request = _build_request(
+            latitude, longitude, hours, api_key, specific_date, timezone_offset,
+            tilt, panel_azimuth, array_type, interval,
+            is_solar_car, solar_car_tilt, solar_car_direction
         )
         
         try:
             forecasts = SolcastAPI.get_forecast(request)
             
+            # 表示テキストの組み立てもこのスレッドで済ませておく
+            # 表示する行と表示設定が前回と同じなら、前回組み立てたテキストをそのまま使う
+            # （表示されない行はテキストに影響しないため、キーには件数だけを含める）
+            has_gti_params = tilt is not None or array_type == "horizontal_single_axis"
+            display_rows = forecasts[:_display_count(display_settings, len(forecasts))]
+            display_key = (
+                len(forecasts),
+                tuple((forecast.time,) + _ROW_FIELDS(forecast) for forecast in display_rows),
+                timezone_offset,
+                has_gti_params,
+                tuple(sorted(display_settings.items())),
+            )
+            if display_key != self._last_display_key:
+                self._last_display_texts = self._format_forecasts(
+                    forecasts, timezone_offset, has_gti_params, display_settings)
+                self._last_display_key = display_key
+            main_text, summary_text, detail_text = self._last_display_texts
+            
             # UI更新はメインスレッドで行う
             self.root.after(0, lambda: self._update_forecast_display(
-                forecasts, timezone_offset, tilt is not None or array_type == "horizontal_single_axis"))
+                forecasts, main_text, summary_text, detail_text))
             
         except Exception as e:
-            import traceback
-            error_msg = f"{str(e)}\n\n{traceback.format_exc()}"
-            print(f"エラー詳細: {error_msg}")
+            error_msg = str(e)
+            
+            # スタックトレースは設定のdebugか環境変数SOLCAST_DEBUGが有効な場合のみ出力する
+            if self.config.get("debug", False) or os.environ.get("SOLCAST_DEBUG"):
+                logger.exception("予測データの取得に失敗しました")
+            else:
+                logger.error("予測データの取得に失敗しました: %s", error_msg)
             self.root.after(0, lambda: self._handle_fetch_error(error_msg))
     
-    def _update_forecast_display(self, forecasts: List[SolarForecast], timezone_offset: int, has_gti_params: bool = False):
-        """予測結果の表示を更新する"""
-        # 取得した全予測データを保存
-        self.forecasts = forecasts
-        
-        # 表示件数の取得と適用
-        try:
-            display_count = int(self.display_count_var.get())
-            if display_count <= 0:
-                display_count = 1
-            elif display_count > len(forecasts):
-                display_count = len(forecasts)
-        except ValueError:
-            display_count = 3  # デフォルト値
-        
+    def _get_display_settings(self) -> dict:
+        """結果表示に使う設定値をTk変数から読み取る"""
         # 時刻指定されているかどうか
-        is_specific_time = self.use_specific_time_var.get()
         specific_time_str = ""
-        if is_specific_time:
+        if self.use_specific_time_var.get():
             try:
                 specific_time_str = f"{self.year_var.get()}-{self.month_var.get()}-{self.day_var.get()} {self.hour_var.get()}:{self.minute_var.get()}"
             except:
                 pass
         
+        return {
+            "display_count": self.display_count_var.get(),
+            "separate_window": self.use_separate_window_var.get(),
+            "specific_time_str": specific_time_str,
+            "panel_type": self.array_type_var.get(),
+            "tilt": self.tilt_var.get(),
+            "panel_azimuth": self.panel_azimuth_var.get(),
+            "solar_car_tilt": self.solar_car_tilt_var.get(),
+            "solar_car_direction": self.solar_car_direction_var.get(),
+        }
+    
+    @staticmethod
+    def _format_forecasts(forecasts: List[SolarForecast], timezone_offset: int,
+                          has_gti_params: bool, settings: dict) -> Tuple[_Segments, str, Optional[_Segments]]:
+        """表示内容を組み立てる（Tkを使わないためワーカースレッドから呼べる）
+        
+        Returns:
+            (メインウィンドウ用の表示内容, 概要ラベル用テキスト, 別ウィンドウ用の表示内容)。
+            別ウィンドウを使わない場合、別ウィンドウ用の表示内容はNone
+        """
+        # 表示件数の取得と適用
+        display_count = _display_count(settings, len(forecasts))
+        
+        specific_time_str = settings.get("specific_time_str", "")
+        panel_type = settings.get("panel_type", "")
+        tilt = settings.get("tilt", "")
+        panel_azimuth = settings.get("panel_azimuth", "")
+        tz_sign = "+" if timezone_offset >= 0 else ""
+        
         # 別ウィンドウ表示が選択されている場合
-        if self.use_separate_window_var.get():
-            # 既存のウィンドウがあるか確認
-            if self.result_window is None or getattr(self.result_window, 'is_closed', True):
-                self.result_window = ResultWindow(self.root, f"予測結果詳細 - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-            
-            # 結果を別ウィンドウに表示
-            self.result_window.display_forecasts(
+        if settings.get("separate_window"):
+            detail_text = ResultWindow.format_forecasts(
                 forecasts, 
                 timezone_offset, 
                 display_count, 
                 has_gti_params,
-                is_specific_time,
+                bool(specific_time_str),
                 specific_time_str
             )
             
-            # メインウィンドウには結果概要のみ表示
-            self.result_text.delete(1.0, tk.END)
-            tz_sign = "+" if timezone_offset >= 0 else ""
-            
-            if not forecasts:
-                self.result_text.insert(tk.END, "予測データが見つかりませんでした\n\n")
-                self.result_text.insert(tk.END, "考えられる原因:\n")
-                self.result_text.insert(tk.END, "・指定された位置情報が正しくない\n")
-                self.result_text.insert(tk.END, "・APIキーが無効または上限に達している\n")
-                self.result_text.insert(tk.END, "・API呼び出しが失敗した\n")
-                self.result_text.insert(tk.END, "\nパラメータを調整して再試行してください\n")
-                self.fetch_button.config(state=tk.NORMAL)
-                self.status_var.set("データなし")
-                return
-            else:
-                self.result_text.insert(tk.END, f"予測データ - 取得: {len(forecasts)}件 (UTC{tz_sign}{timezone_offset})\n\n")
-                self.result_text.insert(tk.END, "※ 詳細は別ウィンドウに表示されています\n")
-                self.result_text.insert(tk.END, "※ 詳細ウィンドウが見つからない場合は、チェックボックスを外して再取得してください\n\n")
-                
-                # パネル設定の説明を追加
-                panel_type = self.array_type_var.get()
-                if panel_type == "fixed":
-                    self.result_text.insert(tk.END, f"※ 固定パネル設定: 傾斜角={self.tilt_var.get() or 'なし'}, 方位角={self.panel_azimuth_var.get() or 'なし'}\n")
-                elif panel_type == "horizontal_single_axis":
-                    self.result_text.insert(tk.END, f"※ 水平一軸追尾型パネル設定: 軸方位角={self.panel_azimuth_var.get() or 'なし'}\n")
-        else:
-            # 従来通りメインウィンドウに表示
-            self.result_text.delete(1.0, tk.END)
-            
-            tz_sign = "+" if timezone_offset >= 0 else ""
-            
             if not forecasts:
-                self.result_text.insert(tk.END, "予測データが見つかりませんでした\n\n")
-                self.result_text.insert(tk.END, "考えられる原因:\n")
-                self.result_text.insert(tk.END, "・指定された位置情報が正しくない\n")
-                self.result_text.insert(tk.END, "・APIキーが無効または上限に達している\n")
-                self.result_text.insert(tk.END, "・API呼び出しが失敗した\n")
-                self.result_text.insert(tk.END, "\nパラメータを調整して再試行してください\n")
-                self.fetch_button.config(state=tk.NORMAL)
-                self.status_var.set("データなし")
-                return
+                return (_NO_DATA_TEXT,), "", detail_text
             
-            # 表示するデータを制限
-            display_forecasts = forecasts[:display_count]
-            
-            self.result_text.insert(tk.END, f"予測データ - 表示: {len(display_forecasts)}件 / 取得: {len(forecasts)}件 (UTC{tz_sign}{timezone_offset})\n\n")
-            
-            # 時刻指定されていた場合の注記
-            if is_specific_time and specific_time_str:
-                self.result_text.insert(tk.END, f"※ 指定日時: {specific_time_str} の近くのデータを表示しています\n")
-            
-            # 利用可能なデータに関する注記を表示
-            self.result_text.insert(tk.END, "※ 利用可能なデータ: 日時、全天日射量(GHI)、直達日射量(DNI)、気温\n")
-            self.result_text.insert(tk.END, "※ 太陽位置(天頂角・方位角)は計算値です\n")
-            
-            # パネル設定の説明を追加
-            panel_type = self.array_type_var.get()
+            # メインウィンドウのテキストは空にして、概要はラベルにだけ表示する
             panel_info = ""
-            
             if panel_type == "fixed":
-                panel_info = f"固定パネル設定: 傾斜角={self.tilt_var.get() or 'なし'}, 方位角={self.panel_azimuth_var.get() or 'なし'}"
+                panel_info = f"\n※ 固定パネル設定: 傾斜角={tilt or 'なし'}, 方位角={panel_azimuth or 'なし'}"
             elif panel_type == "horizontal_single_axis":
-                panel_info = f"水平一軸追尾型パネル設定: 軸方位角={self.panel_azimuth_var.get() or 'なし'}"
-            elif panel_type == "solar_car":
-                panel_info = f"ソーラーカー設定: 初期傾斜角={self.solar_car_tilt_var.get()}°, 走行方位角={self.solar_car_direction_var.get()}°"
+                panel_info = f"\n※ 水平一軸追尾型パネル設定: 軸方位角={panel_azimuth or 'なし'}"
             
-            if panel_info:
-                self.result_text.insert(tk.END, f"※ {panel_info}\n")
-            
-            if panel_type == "solar_car":
-                self.result_text.insert(tk.END, "※ ソーラーカーモードでは走行中の姿勢変化を近似した計算を行います\n")
-                self.result_text.insert(tk.END, "※ 実際の値は走行条件によって変動する可能性があります\n")
-            
-            if not has_gti_params:
-                self.result_text.insert(tk.END, "※ GTIを表示するには傾斜角と方位角を設定してください\n")
-            
-            self.result_text.insert(tk.END, "\n")
+            summary = _SUMMARY_TEMPLATE.format(
+                count=len(forecasts), tz_sign=tz_sign, tz=timezone_offset, panel_info=panel_info)
+            return (), summary, detail_text
+        
+        # 従来通りメインウィンドウに表示
+        if not forecasts:
+            return (_NO_DATA_TEXT,), "", None
+        
+        # 表示するデータを制限
+        display_forecasts = forecasts[:display_count]
+        
+        # 表示内容をまとめてから1回で挿入する
+        parts = []
+        parts.append(f"予測データ - 表示: {len(display_forecasts)}件 / 取得: {len(forecasts)}件 (UTC{tz_sign}{timezone_offset})\n\n")
+        
+        # 注記部分はパネル設定が同じなら毎回同じ内容になるためキャッシュを使う
+        parts.append(_compose_header(
+            panel_type,
+            has_gti_params,
+            specific_time_str,
+            tilt,
+            panel_azimuth,
+            settings.get("solar_car_tilt", ""),
+            settings.get("solar_car_direction", ""),
+        ))
+        
+        # 日時の文字列化は先にまとめて行い、各行はまとめて組み立てる
+        times = _format_datetimes(forecast.time for forecast in display_forecasts)
+        return ("".join(parts), "", *_render_rows(display_forecasts, times, has_gti_params)), "", None
+    
+    def _update_forecast_display(self, forecasts: List[SolarForecast], main_text: _Segments,
+                                 summary_text: str = "", detail_text: Optional[_Segments] = None):
+        """予測結果の表示を更新する"""
+        # 取得した全予測データを保存
+        self.forecasts = forecasts
+        
+        # 別ウィンドウ表示が選択されている場合
+        if detail_text is not None:
+            # 既存のウィンドウがあれば再表示して使い回す
+            title = self._result_window_title()
+            if self.result_window is None:
+                self.result_window = ResultWindow(self.root, title)
+            else:
+                self.result_window.show(title)
             
-            for forecast in display_forecasts:
-                self.result_text.insert(tk.END, f"日時: {forecast.time.strftime('%Y-%m-%d %H:%M')}\n")
-                
-                # データ期間がある場合は表示
-                if hasattr(forecast, 'period') and forecast.period:
-                    self.result_text.insert(tk.END, f"データ期間: {forecast.period}\n")
-                
-                # 気温データがあれば表示
-                if hasattr(forecast, "air_temp") and forecast.air_temp is not None:
-                    self.result_text.insert(tk.END, f"気温: {forecast.air_temp}℃\n")
-                
-                # APIから取得できる値のみ表示
-                self.result_text.insert(tk.END, f"全天日射量(GHI): {forecast.ghi:.2f} W/m²\n")
-                self.result_text.insert(tk.END, f"予測照射量/直達日射量(DNI): {forecast.forecast_radiation:.2f} W/m²\n")
-                
-                # GTIの表示
-                if hasattr(forecast, "gti_valid") and forecast.gti_valid:
-                    self.result_text.insert(tk.END, f"全天傾斜日射量(GTI): {forecast.gti:.2f} W/m²\n")
-                elif has_gti_params:
-                    self.result_text.insert(tk.END, "全天傾斜日射量(GTI): データなし\n")
-                else:
-                    self.result_text.insert(tk.END, "全天傾斜日射量(GTI): 設定が必要\n")
-                
-                # 太陽位置情報（計算値）
-                self.result_text.insert(tk.END, f"太陽天頂角: {forecast.zenith:.2f}°\n")
-                self.result_text.insert(tk.END, f"太陽方位角: {forecast.azimuth:.2f}°\n")
-                
-                self.result_text.insert(tk.END, "-" * 50 + "\n")
+            # 結果を別ウィンドウに表示
+            self.result_window.display_text(detail_text)
+        
+        # 同じ内容なら書き換えないので、別ウィンドウ表示中は実質的に何もしない
+        self._apply_text(main_text)
+        self._show_summary(summary_text)
         
         # UIを元の状態に戻す
         self.fetch_button.config(state=tk.NORMAL)
-        self.status_var.set(f"最終更新: {datetime.now().strftime('%H:%M:%S')}")
+        if not forecasts:
+            self.status_var.set("データなし")
+        else:
+            self.status_var.set(f"最終更新: {_hms(datetime.now())}")
+    
+    def _result_window_title(self) -> str:
+        """別ウィンドウのタイトルを返す（分が変わったときだけ組み立て直す）"""
+        minute = datetime.now().replace(second=0, microsecond=0)
+        if minute != self._last_title_minute:
+            self._last_title_minute = minute
+            self._last_title_str = (f"予測結果詳細 - {minute.year}-{minute.month:02}-{minute.day:02} "
+                                    f"{minute.hour:02}:{minute.minute:02}")
+        return self._last_title_str
+    
+    def _show_summary(self, summary_text: str):
+        """概要ラベルを更新し、概要があるときだけ結果表示の上に配置する"""
+        self.summary_var.set(summary_text)
+        if summary_text:
+            if not self.summary_label.winfo_manager():
+                self.summary_label.pack(fill=tk.X, padx=5, before=self.result_text.master)
+        elif self.summary_label.winfo_manager():
+            self.summary_label.pack_forget()
+    
+    def _apply_text(self, segments: _Segments):
+        """メインウィンドウの結果表示を差し替える（前回と同じ内容なら何もしない）"""
+        text_hash = hash(segments)
+        if text_hash != self._last_render_hash:
+            _replace_text(self.result_text, segments)
+            self._last_render_hash = text_hash
     
     def _handle_fetch_error(self, error_msg: str):
         """データ取得エラーの処理"""